@@ -9,15 +9,26 @@ This file exposes:
  - Proper ODIN protocol handling
 """
 
+import io
+import json
 import os
 import sys
 import time
 import struct
 import shutil
 import subprocess
+import signal
 import tempfile
 import re
+import mmap
+import ctypes
 import hashlib
+import functools
+import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from contextlib import closing, contextmanager
 from typing import Optional, Dict, List, Tuple
 from enum import IntEnum
 
@@ -27,13 +38,57 @@ try:
 except Exception:
     usb = None
 
+try:
+    import usb1
+except Exception:
+    usb1 = None
+
+try:
+    import ahocorasick
+except Exception:
+    ahocorasick = None
+
+try:
+    import blake3
+except Exception:
+    blake3 = None
+
+try:
+    import xxhash
+except Exception:
+    xxhash = None
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
 SAMSUNG_VID = 0x04E8
-EXYNOS_ODIN_PIDS = [0x685D, 0x685D, 0x6860, 0x6861, 0x6863, 0x6864, 0x6866, 0x7000]
+EXYNOS_ODIN_PIDS = [0x685D, 0x6860, 0x6861, 0x6863, 0x6864, 0x6866, 0x7000]
+_ODIN_PIDS = frozenset(EXYNOS_ODIN_PIDS)
 ODIN_MAGIC = b"ODIN"
 LOKE_MAGIC = b"LOKE"
 
 DEFAULT_TIMEOUT_MS = 30000
 
+# Bulk IN request length (one libusb round-trip per request, so bigger is faster)
+BULK_CHUNK = 1 << 20
+# Output buffering for partition dumps (batches many packets per write syscall)
+DUMP_WRITE_BUFFER = 16 * 1024 * 1024
+# Packet payload preallocated from its header; anything larger grows as data arrives,
+# so a corrupt length field cannot force a multi-GB allocation up front
+PACKET_PREALLOC = 16 * 1024 * 1024
+# Payload limit for status/acknowledgment packets
+ACK_MAX_LENGTH = 64 * 1024
+# Largest partition a dump will accept
+MAX_PARTITION_SIZE = 16 * 1024 * 1024 * 1024
+# Bulk IN transfers kept queued when the usb1 (libusb1) backend is available
+ASYNC_DEPTH = 8
+# Minimum seconds between verbose transfer progress lines
+PROGRESS_INTERVAL = 0.5
+_SENT_FMT = "Sent: {:,}/{:,} bytes ({:.1f}%)"
+_RECEIVED_FMT = "Received: {:,} bytes"
+
 # ODIN Protocol Constants
 class OdinCommand(IntEnum):
     SESSION_START = 0x65
@@ -45,10 +100,85 @@ class OdinCommand(IntEnum):
     ERASE_PARTITION = 0x71
     REBOOT = 0x72
 
+# Packet header: [command (1B)] [length (4B)], compiled once
+_ODIN_HEADER = struct.Struct('<BI')
+# Fixed packets, encoded at import time
+_SESSION_END_PKT = struct.pack('<B', OdinCommand.SESSION_END)
+_GET_PIT_PKT = _ODIN_HEADER.pack(OdinCommand.GET_PIT, 0)
+
+@functools.lru_cache(maxsize=1)
+def _which_heimdall(override: Optional[str]) -> Optional[str]:
+    return shutil.which(override or "heimdall")
+
+def _locate_heimdall() -> Optional[str]:
+    """Path to heimdall ($HEIMDALL_BIN overrides the PATH lookup), cached per process"""
+    return _which_heimdall(os.environ.get("HEIMDALL_BIN"))
+
+# Read size for hashing files when hashlib.file_digest is unavailable (< 3.11)
+HASH_CHUNK = 4 * 1024 * 1024
+
+# Write checksum algorithms; 'auto' picks the fastest one installed
+CHECKSUM_ALGOS = ('auto', 'md5', 'sha256', 'blake3', 'xxh3')
+
+def _default_checksum_algo() -> str:
+    if blake3 is not None:
+        return 'blake3'
+    if xxhash is not None:
+        return 'xxh3'
+    return 'md5'
+
+def _new_hash(algorithm: str):
+    """Hash object for algorithm: hashlib names, plus 'blake3' and 'xxh3' when installed"""
+    if algorithm == 'blake3':
+        if blake3 is None:
+            raise XynError("blake3 not available. Install with: pip install blake3")
+        return blake3.blake3()
+    if algorithm == 'xxh3':
+        if xxhash is None:
+            raise XynError("xxhash not available. Install with: pip install xxhash")
+        return xxhash.xxh3_64()
+    return hashlib.new(algorithm)
+
+def _file_digest(path: str, algorithm: str, stop: Optional[threading.Event] = None) -> Optional[str]:
+    """
+    Hex digest of a file: hashlib.file_digest on 3.11+, a readinto loop otherwise
+    With stop, always the loop, returning None once stop is set
+    """
+    with open(path, 'rb') as fh:
+        if stop is None and hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(fh, lambda: _new_hash(algorithm)).hexdigest()
+        
+        h = _new_hash(algorithm)
+        buf = bytearray(HASH_CHUNK)
+        view = memoryview(buf)
+        while True:
+            if stop is not None and stop.is_set():
+                return None
+            n = fh.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+        return h.hexdigest()
+
+def _view_digest(view: memoryview, h, stop: Optional[threading.Event] = None) -> Optional[str]:
+    """
+    Hex digest of an in-memory buffer, fed to hash object h in HASH_CHUNK slices
+    Returns None if stop is set first, so an abandoned hash frees view quickly
+    """
+    for off in range(0, len(view), HASH_CHUNK):
+        if stop is not None and stop.is_set():
+            return None
+        with view[off:off + HASH_CHUNK] as chunk:
+            h.update(chunk)
+    return h.hexdigest()
+
 class XynError(Exception):
     pass
 class OdinProtocolError(XynError):
     pass
+class OdinTimeoutError(OdinProtocolError):
+    """A bulk transfer timed out, whichever backend (pyusb or usb1) ran it"""
+    pass
 
 # -------------------- Partition types --------------------
 class Partition:
@@ -73,11 +203,69 @@ class Partition:
         return f"Partition(name='{self.name}', id={self.id}, size={self.length})"
 
 # -------------------- PIT Parser (COMPLETE) --------------------
+# Binary PIT layout (as read by heimdall's libpit): 28-byte header, then 132-byte entries
+_PIT_HEADER = struct.Struct('<II20s')       # file identifier, entry count, tags
+_PIT_ENTRY = struct.Struct('<9I32s32s32s')  # binary/device type, identifier, attributes,
+                                            # update attributes, block offset, block count,
+                                            # file offset, file size, name, flash/FOTA filename
+# Block size by PIT entry device type: eMMC counts 512-byte sectors, UFS 4 KiB blocks.
+# Other types (OneNAND, file, ...) have no known unit, so their offsets and sizes stay unknown
+PIT_BLOCK_SIZES = {2: 512, 8: 4096}
+if np is not None:
+    _PIT_ENTRY_DTYPE = np.dtype([
+        ('binary_type', '<u4'), ('device_type', '<u4'), ('identifier', '<u4'),
+        ('attributes', '<u4'), ('update_attributes', '<u4'), ('block_offset', '<u4'),
+        ('block_count', '<u4'), ('file_offset', '<u4'), ('file_size', '<u4'),
+        ('partition_name', 'S32'), ('flash_filename', 'S32'), ('fota_filename', 'S32'),
+    ])
+# heimdall print-pit lines: entry marker, name, size or identifier, in one pass
+_RE_PRINT_PIT = re.compile(
+    r"(?P<entry>Partition #|Entry #)"
+    r"|Name:\s*['\"]?(?P<name>[A-Za-z0-9_\-]+)['\"]?"
+    r"|Size:\s*(?P<hex>0[xX])?(?P<size>[0-9A-Fa-f]+)"
+    r"|(?:Identifier|Id|ID):\s*(?P<id>[0-9]+)"
+)
+# Seconds a heimdall print-pit run may take before it is killed
+HEIMDALL_PRINT_TIMEOUT = 20
+_POSIX = os.name == 'posix'
+# Heuristic scan of raw PIT bytes
+_RE_TOKEN = re.compile(rb"([A-Za-z0-9_\-]{3,32})\x00")
+# Header/vendor strings the token scan must not report as partitions
+_TOKEN_BLACKLIST = frozenset(('samsung', 'android', 'partition', 'table', 'header'))
+
+# Common partition names to look for
+_COMMON_PARTITIONS = (
+    'boot', 'recovery', 'system', 'userdata', 'cache', 'modem', 
+    'radio', 'efs', 'param', 'dtb', 'dtbo', 'vbmeta', 'misc',
+    'logo', 'cp', 'aboot', 'sbl', 'rpm', 'tz', 'hyp', 'lk',
+    'bootloader', 'pit', 'hidden', 'metadata'
+)
+# (name, byte patterns) - the name in various encodings, most likely first.
+# b"\x00name\x00" is not listed: any match of it is already a match of b"name\x00"
+_COMMON_PARTITION_PATTERNS = [
+    (n, (n.encode('ascii') + b'\x00',
+         n.upper().encode('ascii') + b'\x00'))
+    for n in _COMMON_PARTITIONS
+]
+
 class PitParser:
     PIT_HEADER_MAGIC = b"SEANDROID"
+    PIT_FILE_IDENTIFIER = 0x12349876
     
     def __init__(self, heimdall_path: Optional[str] = None):
-        self.heimdall = heimdall_path or shutil.which("heimdall")
+        self.heimdall = heimdall_path
+        self._automaton = self._build_automaton() if ahocorasick is not None else None
+
+    @staticmethod
+    def _build_automaton():
+        """Aho-Corasick automaton matching every common partition name in one pass"""
+        automaton = ahocorasick.Automaton()
+        for rank, (_, patterns) in enumerate(_COMMON_PARTITION_PATTERNS):
+            for prio, pattern in enumerate(patterns):
+                key = pattern.decode('latin-1') if ahocorasick.unicode else pattern
+                automaton.add_word(key, (rank, prio, len(pattern)))
+        automaton.make_automaton()
+        return automaton
 
     def parse_with_heimdall_file(self, pit_path: str) -> List[Partition]:
         """Parse PIT file using heimdall print-pit command"""
@@ -92,11 +280,104 @@ class PitParser:
         
         for cmd in cmds:
             try:
-                p = subprocess.run(cmd, capture_output=True, text=True, timeout=20)
-                if p.returncode == 0 and p.stdout:
-                    return self._parse_text(p.stdout)
+                # Parse stdout as it streams in rather than buffering and decoding it whole.
+                # The deadline runs on a timer: a heimdall that hangs with stdout open
+                # would otherwise block the read loop forever
+                timed_out = threading.Event()
+                with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                      bufsize=1 << 16, start_new_session=_POSIX) as p:
+                    def kill():
+                        # The whole group: a child still holding stdout would keep the read blocked
+                        try:
+                            if _POSIX:
+                                os.killpg(p.pid, signal.SIGKILL)
+                            else:
+                                p.kill()
+                        except ProcessLookupError:
+                            pass
+                    def expire():
+                        timed_out.set()
+                        kill()
+                    timer = threading.Timer(HEIMDALL_PRINT_TIMEOUT, expire)
+                    timer.start()
+                    try:
+                        lines = io.TextIOWrapper(p.stdout, encoding='utf-8', errors='replace', newline='\n')
+                        parts = self._parse_lines(lines)
+                        returncode = p.wait()
+                    except BaseException:
+                        # Its own session gets no Ctrl-C, so take it down with us
+                        kill()
+                        raise
+                    finally:
+                        timer.cancel()
+                if timed_out.is_set():
+                    raise XynError(f"heimdall print-pit timed out after {HEIMDALL_PRINT_TIMEOUT}s")
+                if returncode == 0 and parts:
+                    return parts
+            except XynError:
+                raise
             except Exception as e:
-                continue        raise RuntimeError("heimdall print-pit failed")
+                continue
+        raise RuntimeError("heimdall print-pit failed")
+
+    def parse_pit_binary(self, data: bytes) -> List[Partition]:
+        """
+        Parse a binary PIT image natively (no heimdall process)
+        Raises ValueError if data is not a PIT image
+        """
+        if len(data) < _PIT_HEADER.size:
+            raise ValueError("PIT data too short")
+        
+        magic, count, _ = _PIT_HEADER.unpack_from(data)
+        if magic != self.PIT_FILE_IDENTIFIER:
+            raise ValueError(f"Bad PIT file identifier: {magic:#010x}")
+        
+        end = _PIT_HEADER.size + count * _PIT_ENTRY.size
+        if len(data) < end:
+            raise ValueError(f"PIT data truncated ({count} entries declared)")
+        
+        if np is not None:
+            # One view over the whole entry table, columns pulled out in bulk
+            arr = np.frombuffer(data, dtype=_PIT_ENTRY_DTYPE, count=count, offset=_PIT_HEADER.size)
+            entries = zip(arr['device_type'].tolist(), arr['identifier'].tolist(),
+                          arr['block_offset'].tolist(), arr['block_count'].tolist(),
+                          arr['partition_name'].tolist(), arr['flash_filename'].tolist())
+        else:
+            entries = ((e[1], e[2], e[5], e[6], e[9], e[10])
+                       for e in _PIT_ENTRY.iter_unpack(memoryview(data)[_PIT_HEADER.size:end]))
+        
+        parts: List[Partition] = []
+        for device_type, identifier, block_offset, block_count, name, filename in entries:
+            name = name.split(b'\x00', 1)[0].decode('ascii', errors='ignore')
+            if not name:
+                continue
+            filename = filename.split(b'\x00', 1)[0].decode('ascii', errors='ignore')
+            block_size = PIT_BLOCK_SIZES.get(device_type)
+            if block_size is None:
+                start = length = None
+            else:
+                start = block_offset * block_size
+                length = block_count * block_size or None
+            parts.append(Partition(name=name, start=start, length=length,
+                                   id=identifier, filename=filename or None))
+        return parts
+
+    def parse_bytes(self, data: bytes) -> List[Partition]:
+        """Parse in-memory PIT data: native layout first, heuristic otherwise"""
+        try:
+            return self.parse_pit_binary(data)
+        except ValueError:
+            return self.parse_heuristic(data)
+
+    def parse_pit_file(self, pit_path: str) -> List[Partition]:
+        """Parse a PIT file natively, falling back to heimdall print-pit"""
+        with open(pit_path, "rb") as fh:
+            data = fh.read()
+        
+        try:
+            return self.parse_pit_binary(data)
+        except ValueError:
+            return self.parse_with_heimdall_file(pit_path)
 
     def parse_heuristic(self, pit_bytes: bytes) -> List[Partition]:
         """
@@ -106,51 +387,23 @@ class PitParser:
         parts: List[Partition] = []
         seen_names = set()
         
-        # Common partition names to look for
-        common_partitions = [
-            'boot', 'recovery', 'system', 'userdata', 'cache', 'modem', 
-            'radio', 'efs', 'param', 'dtb', 'dtbo', 'vbmeta', 'misc',
-            'logo', 'cp', 'aboot', 'sbl', 'rpm', 'tz', 'hyp', 'lk',
-            'bootloader', 'pit', 'hidden', 'metadata'
-        ]
-        
         # Search for partition names in the binary data
-        for common_name in common_partitions:
-            # Look for the name in various encodings
-            patterns = [
-                common_name.encode('ascii') + b'\x00',
-                b'\x00' + common_name.encode('ascii') + b'\x00',
-                common_name.upper().encode('ascii') + b'\x00',
-            ]
-            
-            for pattern in patterns:
-                if pattern in pit_bytes:
-                    if common_name not in seen_names:
-                        seen_names.add(common_name)
-                        # Try to find size information near the name
-                        idx = pit_bytes.find(pattern)
-                        # Look for size values (4-byte integers) near the name
-                        search_window = pit_bytes[max(0, idx-64):min(len(pit_bytes), idx+256)]
-                        sizes = []
-                        # Find potential size values (skip very small or very large)
-                        for i in range(0, len(search_window) - 4, 4):
-                            val = int.from_bytes(search_window[i:i+4], 'little')
-                            if 0x1000 <= val <= 0x100000000:  # Reasonable partition sizes
-                                sizes.append(val)
-                        
-                        size = sizes[0] if sizes else None
-                        parts.append(Partition(name=common_name, length=size))
-                        break
+        for common_name, idx in self._find_common_names(pit_bytes):
+            seen_names.add(common_name)
+            # Look for size values (4-byte integers) near the name
+            search_window = pit_bytes[max(0, idx-64):min(len(pit_bytes), idx+256)]
+            size = self._first_size_candidate(search_window)
+            parts.append(Partition(name=common_name, length=size))
         
         # Also try regex for any other partition-like names
-        tokens = re.findall(rb"([A-Za-z0-9_\-]{3,32})\x00", pit_bytes)
+        tokens = _RE_TOKEN.findall(pit_bytes)
         for t in tokens:
-            s = t.decode('ascii', errors='ignore').lower()            if len(s) < 3 or len(s) > 32:
+            # Tokens are ASCII by construction: fold case bytewise, then decode.
+            # The lowercase result always satisfies [a-z0-9_-], so no name filter is needed
+            s = t.lower().decode('ascii')
+            if len(s) < 3 or len(s) > 32:
                 continue
-            if s in seen_names or s in ['samsung', 'android', 'partition', 'table', 'header']:
-                continue
-            # Filter out unlikely partition names
-            if not re.match(r'^[a-z0-9_\-]+$', s):
+            if s in seen_names or s in _TOKEN_BLACKLIST:
                 continue
             if s not in seen_names:
                 seen_names.add(s)
@@ -158,6 +411,54 @@ class PitParser:
         
         return parts
 
+    @staticmethod
+    def _first_size_candidate(window: bytes) -> Optional[int]:
+        """First aligned little-endian u32 in window that looks like a partition size"""
+        if np is not None:
+            # Same words as range(0, len(window) - 4, 4)
+            arr = np.frombuffer(window, dtype='<u4', count=max(0, (len(window) - 1) // 4))
+            # Every u32 is below the 0x100000000 ceiling, so only the floor needs testing
+            mask = arr >= 0x1000
+            i = int(mask.argmax()) if arr.size else 0
+            return int(arr[i]) if arr.size and mask[i] else None
+        
+        # Find potential size values (skip very small or very large)
+        for i in range(0, len(window) - 4, 4):
+            val = int.from_bytes(window[i:i+4], 'little')
+            if 0x1000 <= val <= 0x100000000:  # Reasonable partition sizes
+                return val
+        return None
+
+    def _find_common_names(self, pit_bytes: bytes) -> List[Tuple[str, int]]:
+        """
+        Locate common partition names in raw PIT bytes
+        Returns (name, offset of first match) in _COMMON_PARTITIONS order
+        """
+        hits: List[Tuple[str, int]] = []
+        
+        if self._automaton is not None:
+            # latin-1 maps bytes 1:1 to code points, so offsets are preserved
+            haystack = pit_bytes.decode('latin-1') if ahocorasick.unicode else pit_bytes
+            first: Dict[Tuple[int, int], int] = {}
+            for end_idx, (rank, prio, length) in self._automaton.iter(haystack):
+                if (rank, prio) not in first:
+                    first[(rank, prio)] = end_idx - length + 1
+            
+            for rank, (name, _) in enumerate(_COMMON_PARTITION_PATTERNS):
+                idx = first.get((rank, 0), first.get((rank, 1)))
+                if idx is not None:
+                    hits.append((name, idx))
+            return hits
+        
+        for common_name, patterns in _COMMON_PARTITION_PATTERNS:
+            for pattern in patterns:
+                idx = pit_bytes.find(pattern)
+                if idx == -1:
+                    continue
+                hits.append((common_name, idx))
+                break
+        return hits
+
     def parse_via_heimdall_device(self, heimdall_bin: str) -> List[Partition]:
         """Download PIT from device using heimdall and parse it"""
         tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pit")
@@ -166,59 +467,52 @@ class PitParser:
         
         try:
             cmd = [heimdall_bin, "download-pit", "--output", tmp_path]
-            r = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            # Only the PIT written to tmp_path matters; keep stderr for the error message
+            r = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=60)
             if r.returncode != 0:
-                raise RuntimeError(f"heimdall download-pit failed: {r.stderr}")
+                raise RuntimeError(f"heimdall download-pit failed: {r.stderr.decode(errors='ignore')}")
             
-            return self.parse_with_heimdall_file(tmp_path)
+            return self.parse_pit_file(tmp_path)
         finally:
             try:
-                os.remove(tmp_path)
-            except Exception:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
                 pass
 
     def _parse_text(self, text: str) -> List[Partition]:
         """Parse heimdall print-pit output text"""
+        return self._parse_lines(text.splitlines())
+
+    def _parse_lines(self, lines) -> List[Partition]:
+        """Parse heimdall print-pit output, one line at a time"""
         parts: List[Partition] = []
-        current_part = None
         name = None
         size = None
         pid = None
         
-        for line in text.splitlines():
-            line = line.strip()
-            
-            # Look for partition start markers
-            if 'Partition #' in line or 'Entry #' in line:
-                if current_part:
-                    parts.append(current_part)
-                current_part = None
-                name = None
-                size = None                pid = None
-            
-            # Extract name
-            m = re.search(r"Name:\s*['\"]?([A-Za-z0-9_\-]+)['\"]?", line)
-            if m:
-                name = m.group(1).lower()
-                continue
-            
-            # Extract size (hex or decimal)
-            msize = re.search(r"Size:\s*(?:0x)?([0-9A-Fa-f]+)", line)
-            if msize:
-                try:
-                    size = int(msize.group(1), 16 if '0x' in line.lower() else 10)
-                except ValueError:
-                    pass
+        for line in lines:
+            m = _RE_PRINT_PIT.search(line)
+            if not m:
                 continue
+            field = m.lastgroup
             
-            # Extract identifier/ID
-            mid = re.search(r"(?:Identifier|Id|ID):\s*([0-9]+)", line)
-            if mid:
+            # Partition start marker
+            if field == 'entry':
+                if name:
+                    parts.append(Partition(name=name, length=size, id=pid))
+                name = None
+                size = None
+                pid = None
+            elif field == 'name':
+                name = m.group('name').lower()
+            elif field == 'size':
+                # Hex when prefixed with 0x, decimal otherwise
                 try:
-                    pid = int(mid.group(1))
+                    size = int(m.group('size'), 16 if m.group('hex') else 10)
                 except ValueError:
                     pass
-                continue
+            else:
+                pid = int(m.group('id'))
         
         # Don't forget the last partition
         if name:
@@ -230,87 +524,135 @@ class PitParser:
               heimdall_bin: Optional[str] = None, bridge=None) -> List[Partition]:
         """
         Parse PIT file using multiple methods, in order of preference:
-        1. Heimdall with PIT file path
+        1. PIT file path (native, heimdall print-pit fallback)
         2. Heimdall download from device
-        3. Heuristic parsing of bytes
+        3. Native or heuristic parsing of bytes
         4. Bridge download + parse
         """
         hb = heimdall_bin or self.heimdall
         
-        # Method 1: Heimdall with PIT file
-        if hb and pit_path and os.path.exists(pit_path):
+        # Method 1: PIT file
+        if pit_path:
             try:
-                return self.parse_with_heimdall_file(pit_path)
+                return self.parse_pit_file(pit_path)
             except Exception as e:
                 pass
-                # Method 2: Heimdall download from device
+        
+        # Method 2: Heimdall download from device
         if hb and bridge:
             try:
                 return self.parse_via_heimdall_device(hb)
             except Exception as e:
                 pass
         
-        # Method 3: Heuristic parsing of bytes
+        # Method 3: Native, then heuristic parsing of bytes
         if pit_bytes:
+            try:
+                return self.parse_pit_binary(pit_bytes)
+            except ValueError:
+                pass
             try:
                 return self.parse_heuristic(pit_bytes)
             except Exception as e:
                 pass
         
-        # Method 4: Download via bridge and parse
+        # Method 4: Download via bridge and parse in memory
         if bridge:
-            tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pit")
-            tmp_path = tmp.name
-            tmp.close()
-            
-            try:
-                ok = bridge.download_pit(tmp_path)
-                if not ok:
-                    raise RuntimeError("bridge.download_pit failed")
-                
-                with open(tmp_path, "rb") as fh:
-                    data = fh.read()
-                
-                # Try heimdall parsing if available
-                if hb:
-                    try:
-                        return self.parse_with_heimdall_file(tmp_path)
-                    except Exception:
-                        pass
-                
-                # Fallback to heuristic
-                return self.parse_heuristic(data)
-            finally:
-                try:
-                    os.remove(tmp_path)
-                except Exception:
-                    pass
+            return self.parse_bytes(bridge._download_pit_bytes())
         
         return []
 
 # -------------------- PartitionManager --------------------
+# Common partition ID mappings (ODIN protocol)
+_COMMON_PART_IDS: Dict[str, int] = {
+    'boot': 1, 'recovery': 2, 'system': 3, 'userdata': 4, 
+    'cache': 5, 'modem': 6, 'radio': 6, 'efs': 7, 'param': 8,
+    'dtb': 9, 'dtbo': 10, 'vbmeta': 11, 'misc': 12
+}
+
+def _pit_cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "xynclient")
+
 class PartitionManager:
     def __init__(self, bridge):
         self.bridge = bridge
-        self.parser = PitParser(heimdall_path=self._find_heimdall())        self.partitions: Dict[str, Partition] = {}
+        self.parser = PitParser(heimdall_path=bridge._heimdall_path)
+        self.partitions: Dict[str, Partition] = {}
+        # (name, info) pairs in name order, rebuilt only when the layout is detected
+        self.sorted_partitions: Tuple[Tuple[str, Dict], ...] = ()
         self._layout_detected = False
+        # The layout came from the disk cache and has not been checked against the device
+        self._from_cache = False
 
     def _find_heimdall(self) -> Optional[str]:
-        return shutil.which("heimdall")
+        return self.bridge._heimdall_path
 
-    def detect_partition_layout(self) -> Dict[str, Dict]:
+    def _cache_path(self) -> Optional[str]:
+        """
+        On-disk PIT cache file for the connected device, keyed by VID/PID/serial
+        None when the device reports no serial: VID/PID alone is shared by every
+        phone in download mode, so caching on it could serve another device's layout
+        """
+        dev = self.bridge.dev
+        if dev is None or usb is None or not getattr(dev, 'iSerialNumber', 0):
+            return None
+        try:
+            serial = usb.util.get_string(dev, dev.iSerialNumber)
+        except Exception:
+            return None
+        if not serial:
+            return None
+        serial = re.sub(r"[^A-Za-z0-9_\-]", "_", serial)
+        return os.path.join(_pit_cache_dir(), f"pit-{dev.idVendor:04x}-{dev.idProduct:04x}-{serial}.json")
+
+    def _load_cache(self, path: str) -> List[Partition]:
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                return [Partition(**d) for d in json.load(fh)]
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError, TypeError) as e:
+            self.bridge._log(f"Ignoring unreadable PIT cache {path}: {e}")
+            return []
+
+    def _save_cache(self, path: str, parts: List[Partition]) -> None:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump([p.to_dict() for p in parts], fh)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.bridge._log(f"Could not write PIT cache {path}: {e}")
+
+    def detect_partition_layout(self, refresh: bool = False, use_cache: bool = False) -> Dict[str, Dict]:
         """
         Detect partition layout using multiple methods
         Returns dict of partition name -> partition info
+        A layout read from the device is cached on disk per device (unless the
+        bridge has pit_cache disabled). Only use_cache=True (listing) may answer
+        from that cache: it is never invalidated by a repartition, so read/write/erase
+        always get the device's current PIT. refresh=True ignores both caches
         """
-        if self._layout_detected and self.partitions:
-            return {name: p.to_dict() for name, p in self.partitions.items()}
+        if self._layout_detected and self.partitions and not refresh \
+                and (use_cache or not self._from_cache):
+            return self._layout_dict()
         
         parts: List[Partition] = []
         hb = self._find_heimdall()
+        cache_path = self._cache_path() if self.bridge.pit_cache else None
+        from_cache = False
+        
+        if cache_path and use_cache and not refresh:
+            parts = self._load_cache(cache_path)
+            if parts:
+                self.bridge._log(f"Partition layout from cache {cache_path}: {len(parts)} partitions")
+                cache_path = None
+                from_cache = True
         
         # Try heimdall first (most reliable)
-        if hb:
+        if hb and not parts:
             try:
                 parts = self.parser.parse(heimdall_bin=hb, bridge=self.bridge)
                 if parts:
@@ -318,14 +660,18 @@ class PartitionManager:
             except Exception as e:
                 self.bridge._log(f"Heimdall partition detection failed: {e}")
         
-        # Fallback to bridge download
+        # Fallback to ODIN download, parsed in memory
         if not parts:
             try:
-                parts = self.parser.parse(bridge=self.bridge)
+                parts = self.parser.parse_bytes(self.bridge._download_pit_bytes())
                 if parts:
-                    self.bridge._log(f"Partition detection via heuristic: {len(parts)} partitions")
+                    self.bridge._log(f"Partition detection via PIT download: {len(parts)} partitions")
             except Exception as e:
-                self.bridge._log(f"Heuristic partition detection failed: {e}")
+                self.bridge._log(f"PIT download partition detection failed: {e}")
+        
+        # Only a layout actually read from the device is worth caching
+        if parts and cache_path:
+            self._save_cache(cache_path, parts)
         
         # Add common partitions if detection failed
         if not parts:
@@ -334,14 +680,22 @@ class PartitionManager:
             parts = [Partition(name=name) for name in common_parts]
         
         self.partitions = {p.name: p for p in parts}
+        self._from_cache = from_cache
+        self.sorted_partitions = tuple((name, self.partitions[name].to_dict())
+                                       for name in sorted(self.partitions))
         self._layout_detected = True
         
-        return {name: p.to_dict() for name, p in self.partitions.items()}
+        return self._layout_dict()
+
+    def _layout_dict(self) -> Dict[str, Dict]:
+        """Name-ordered copy of the layout; callers may mutate it without touching sorted_partitions"""
+        return {name: dict(info) for name, info in self.sorted_partitions}
 
     def get_partition_by_name(self, name: str) -> Optional[Partition]:
         """Get partition by name, detecting layout if needed"""
         name_lower = name.lower()
-        if not self.partitions:            self.detect_partition_layout()
+        if not self.partitions or self._from_cache:
+            self.detect_partition_layout()
         return self.partitions.get(name_lower)
 
     def guess_partition_identifier(self, name: str) -> int:
@@ -350,34 +704,295 @@ class PartitionManager:
         if p and p.id is not None:
             return p.id
         
-        # Common partition ID mappings (ODIN protocol)
-        common_map = {
-            'boot': 1, 'recovery': 2, 'system': 3, 'userdata': 4, 
-            'cache': 5, 'modem': 6, 'radio': 6, 'efs': 7, 'param': 8,
-            'dtb': 9, 'dtbo': 10, 'vbmeta': 11, 'misc': 12
-        }
-        return common_map.get(name.lower(), 0xFFFFFFFF)
+        key = name if name.islower() else name.lower()
+        return _COMMON_PART_IDS.get(key, 0xFFFFFFFF)
+
+# -------------------- Logging --------------------
+class BufferedLogger:
+    """
+    Writes log lines from a daemon thread, batched into one os.write per
+    flush_interval (or per limit bytes); log() only queues the line, so
+    transfer loops never wait on the terminal
+    """
+    def __init__(self, fd: int = 2, flush_interval: float = 0.01, limit: int = 64 * 1024):
+        self.fd = fd
+        self.flush_interval = flush_interval
+        self.limit = limit
+        self._buf = bytearray()
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._drain, name='xyn-log', daemon=True)
+        self._thread.start()
+
+    def log(self, line: str) -> None:
+        self._queue.put_nowait(line)
+
+    def _write_out(self) -> None:
+        view = memoryview(self._buf)
+        while view:
+            view = view[os.write(self.fd, view):]
+        view.release()
+        self._buf.clear()
+
+    def _drain(self) -> None:
+        get = self._queue.get
+        buf = self._buf
+        while True:
+            try:
+                # Block while idle; with lines pending, wait at most flush_interval for more
+                item = get(timeout=self.flush_interval) if buf else get()
+            except queue.Empty:
+                self._write_out()
+                continue
+            if isinstance(item, str):
+                buf += item.encode('utf-8', 'replace')
+                buf += b'\n'
+                if len(buf) >= self.limit:
+                    self._write_out()
+                continue
+            # flush()/close() marker: write everything queued before it
+            self._write_out()
+            if item is None:
+                return
+            item.set()
+
+    def flush(self) -> None:
+        """Block until every line logged so far has been written"""
+        done = threading.Event()
+        self._queue.put_nowait(done)
+        done.wait()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put_nowait(None)
+            self._thread.join()
+
+# -------------------- Async bulk transfers (usb1) --------------------
+def _dev_mem_alloc(handle, size: int):
+    """
+    Allocate a DMA-able buffer with libusb_dev_mem_alloc (usbfs mmap, Linux only)
+    Returns (pointer, memoryview) or None when unsupported, so callers fall back
+    to ordinary bytearrays
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        # python-libusb1 does not wrap these, call into its loaded CDLL directly
+        lib = usb1.libusb1.libusb
+        alloc = lib.libusb_dev_mem_alloc
+    except AttributeError:
+        return None
+    alloc.restype = ctypes.c_void_p
+    alloc.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+    raw = handle._USBDeviceHandle__handle
+    ptr = alloc(raw, size)
+    if not ptr:
+        return None
+    return ptr, memoryview((ctypes.c_ubyte * size).from_address(ptr)).cast('B')
+
+def _dev_mem_free(handle, ptr: int, size: int) -> None:
+    free = usb1.libusb1.libusb.libusb_dev_mem_free
+    free.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t]
+    free(handle._USBDeviceHandle__handle, ptr, size)
+
+def _transfer_buffers(handle, depth: int, size: int, spare=()):
+    """
+    depth transfer buffers of size bytes: libusb device memory where available,
+    else views of the bridge's preallocated spares, else fresh bytearrays
+    Returns (buffers, dev_mem) with dev_mem listing the (pointer, size) to free
+    """
+    buffers = []
+    dev_mem = []
+    spare = [b for b in spare if len(b) >= size]
+    for _ in range(depth):
+        # Prefer device memory so usbfs can skip its bounce copy
+        mem = _dev_mem_alloc(handle, size)
+        if mem is not None:
+            dev_mem.append((mem[0], size))
+            buffers.append(mem[1])
+        elif spare:
+            buffers.append(memoryview(spare.pop())[:size])
+        else:
+            buffers.append(bytearray(size))
+    return buffers, dev_mem
+
+def _free_transfer_buffers(handle, dev_mem) -> None:
+    for ptr, size in dev_mem:
+        _dev_mem_free(handle, ptr, size)
+    dev_mem.clear()
+
+class _AsyncBulkReader:
+    """
+    Keeps several bulk IN transfers submitted on a usb1 handle so the host
+    controller always has a request queued, and yields their payloads in order
+    """
+    def __init__(self, context, handle, endpoint: int, size: int, depth: int, timeout: int,
+                 spare=()):
+        self.context = context
+        self.handle = handle
+        self.transfers = []
+        buffers, self._dev_mem = _transfer_buffers(handle, depth, size, spare)
+        for buf in buffers:
+            transfer = handle.getTransfer()
+            transfer.setBulk(endpoint, buf, timeout=timeout)
+            self.transfers.append(transfer)
+        self._queue = deque()
+
+    def __iter__(self):
+        pending = self._queue
+        for transfer in self.transfers:
+            transfer.submit()
+            pending.append(transfer)
+        
+        while pending:
+            transfer = pending[0]
+            while transfer.isSubmitted():
+                self.context.handleEvents()
+            pending.popleft()
+            
+            status = transfer.getStatus()
+            if status == usb1.TRANSFER_TIMED_OUT:
+                raise OdinTimeoutError("Bulk IN timeout")
+            if status != usb1.TRANSFER_COMPLETED:
+                raise OdinProtocolError(f"Bulk IN transfer failed (status {status})")
+            
+            # The buffer is lent to the caller and resubmitted once it asks for more
+            yield memoryview(transfer.getBuffer())[:transfer.getActualLength()]
+            transfer.submit()
+            pending.append(transfer)
+
+    def close(self) -> None:
+        """Cancel queued transfers and wait for libusb to hand them back"""
+        for transfer in self._queue:
+            try:
+                transfer.cancel()
+            except usb1.USBError:
+                pass
+        while any(t.isSubmitted() for t in self._queue):
+            self.context.handleEvents()
+        self._queue.clear()
+        _free_transfer_buffers(self.handle, self._dev_mem)
+
+class _AsyncBulkWriter:
+    """
+    Keeps several bulk OUT transfers in flight on a usb1 handle; each ODIN
+    packet is framed straight into a free transfer's buffer while earlier
+    ones are still on the bus
+    """
+    def __init__(self, context, handle, endpoint: int, size: int, depth: int, timeout: int,
+                 spare=()):
+        self.context = context
+        self.handle = handle
+        self._free = deque()
+        buffers, self._dev_mem = _transfer_buffers(handle, depth, _ODIN_HEADER.size + size, spare)
+        for buf in buffers:
+            transfer = handle.getTransfer()
+            transfer.setBulk(endpoint, buf, timeout=timeout)
+            self._free.append((transfer, buf))
+        self._queue = deque()
+
+    def send(self, command: int, data: bytes = b'') -> bool:
+        """Queue one packet, waiting for the oldest transfer if none is free"""
+        transfer, buf = self._free.popleft() if self._free else self._reap()
+        end = _ODIN_HEADER.size + len(data)
+        _ODIN_HEADER.pack_into(buf, 0, command, len(data))
+        buf[_ODIN_HEADER.size:end] = data
+        # A writable memoryview keeps setBuffer zero-copy
+        transfer.setBuffer(memoryview(buf)[:end])
+        transfer.submit()
+        self._queue.append((transfer, buf))
+        return True
+
+    def _reap(self):
+        transfer, buf = self._queue.popleft()
+        while transfer.isSubmitted():
+            self.context.handleEvents()
+        
+        status = transfer.getStatus()
+        if status == usb1.TRANSFER_TIMED_OUT:
+            raise OdinTimeoutError("Bulk OUT timeout")
+        if status != usb1.TRANSFER_COMPLETED:
+            raise OdinProtocolError(f"Bulk OUT transfer failed (status {status})")
+        return transfer, buf
+
+    def flush(self) -> None:
+        """Wait until every queued packet has been sent"""
+        while self._queue:
+            self._free.append(self._reap())
+
+    def close(self) -> None:
+        """Cancel queued transfers and wait for libusb to hand them back"""
+        for transfer, _ in self._queue:
+            try:
+                transfer.cancel()
+            except usb1.USBError:
+                pass
+        while any(t.isSubmitted() for t, _ in self._queue):
+            self.context.handleEvents()
+        self._queue.clear()
+        _free_transfer_buffers(self.handle, self._dev_mem)
 
 # -------------------- ExynosBridge core (COMPLETE) --------------------
 class ExynosBridge:
-    def __init__(self, verbose: bool = False, timeout: int = 30):
+    def __init__(self, verbose: bool = False, timeout: int = 30, in_chunk_size: int = BULK_CHUNK,
+                 async_depth: int = ASYNC_DEPTH, out_chunk_size: int = BULK_CHUNK,
+                 checksum_algo: str = 'auto', pit_cache: bool = True,
+                 logger: Optional[BufferedLogger] = None):
         self.verbose = verbose
+        self.logger = logger
         self.timeout_ms = timeout * 1000
+        self.in_chunk_size = in_chunk_size
+        self.async_depth = async_depth
+        self.out_chunk_size = out_chunk_size
+        self.checksum_algo = _default_checksum_algo() if checksum_algo == 'auto' else checksum_algo
+        # Fail here, not partway through a write, if the algorithm's module is missing
+        try:
+            _new_hash(self.checksum_algo)
+        except ValueError:
+            raise XynError(f"Unsupported checksum algorithm: {self.checksum_algo}")
+        self.pit_cache = pit_cache
+        self._out_buffer = None
+        self._in_buffer = None
+        self._in_tail = None
+        self._transfer_buffers: List[bytearray] = []
         self.dev = None
         self.interface = None
         self.in_ep = None
         self.out_ep = None
+        self.in_max_packet = None
         self.detached_kernel = False
         self.session_established = False
+        # Looked up once; PartitionManager hands the same path to its PitParser
+        self._heimdall_path = _locate_heimdall()
         self.partition_manager = PartitionManager(self)
         self.protocol_version = 3  # ODIN protocol version
 
     def _log(self, *a):
         if self.verbose:
-            print("[DEBUG]", *a)
+            if self.logger is not None:
+                self.logger.log(" ".join(map(str, ("[DEBUG]",) + a)))
+            else:
+                print("[DEBUG]", *a)
 
     def _find_heimdall(self) -> Optional[str]:
-        return shutil.which("heimdall")
+        return self._heimdall_path
+
+    def alloc_transfer_buffers(self, n: Optional[int] = None, size: Optional[int] = None) -> None:
+        """
+        Preallocate the buffers queued usb1 transfers fall back to when libusb
+        device memory is unavailable, so every read and write reuses them
+        Defaults: async_depth buffers, large enough for either direction
+        Called on the first usb1 transfer; heimdall and pyusb-only sessions never allocate
+        """
+        if usb1 is None or self.async_depth <= 1:
+            return
+        n = n or self.async_depth
+        size = size or max(self._in_transfer_size(), _ODIN_HEADER.size + self.out_chunk_size)
+        self._transfer_buffers = [bytearray(size) for _ in range(n)]
+
+    def _in_transfer_size(self) -> int:
+        """Bulk IN request length, rounded down to a multiple of wMaxPacketSize"""
+        mps = self.in_max_packet or 512
+        return max(mps, self.in_chunk_size - self.in_chunk_size % mps)
 
     # ==================== Connection Management ====================
     
@@ -390,15 +1005,22 @@ class ExynosBridge:
             raise XynError("No Exynos device found in ODIN mode")
         
         self.open_and_claim()
-        self.establish_session()        return True
+        self.establish_session()
+        return True
 
-    def disconnect(self) -> None:
-        """Cleanly disconnect from device"""
+    def disconnect(self, release: bool = True) -> None:
+        """
+        Cleanly disconnect from device
+        release=False only ends the ODIN session and leaves releasing the
+        interface to the process exiting (no kernel driver may be detached)
+        """
         try:
             if self.session_established:
                 self._end_session()
         except Exception:
             pass
+        if not release:
+            return
         
         if self.dev and self.interface is not None:
             try:
@@ -416,6 +1038,7 @@ class ExynosBridge:
         self.interface = None
         self.in_ep = None
         self.out_ep = None
+        self.in_max_packet = None
         self.detached_kernel = False
         self.session_established = False
 
@@ -429,17 +1052,19 @@ class ExynosBridge:
         if usb is None:
             raise XynError("pyusb not available. Install with: pip install pyusb")
         
-        # First try known ODIN PIDs
-        for pid in EXYNOS_ODIN_PIDS:
-            dev = usb.core.find(idVendor=SAMSUNG_VID, idProduct=pid)
-            if dev:
+        # Enumerate once; both passes below walk the same list
+        devices = list(usb.core.find(find_all=True, idVendor=SAMSUNG_VID))
+        
+        # First try known ODIN PIDs (set lookup per device)
+        for dev in devices:
+            if self._definitely_odin(dev.idProduct):
                 self.dev = dev
-                self._log(f"Found device in ODIN mode: VID={hex(SAMSUNG_VID)} PID={hex(pid)}")
+                self._log(f"Found device in ODIN mode: VID={hex(SAMSUNG_VID)} PID={hex(dev.idProduct)}")
                 return True
         
-        # Fallback: check all Samsung devices and verify ODIN mode
-        devices = usb.core.find(find_all=True, idVendor=SAMSUNG_VID)
-        for dev in devices:            # Try to establish ODIN session to verify mode
+        # Fallback: probe the remaining Samsung devices for ODIN mode
+        for dev in devices:
+            # Try to establish ODIN session to verify mode
             try:
                 self.dev = dev
                 # Temporarily set up for handshake test
@@ -469,15 +1094,22 @@ class ExynosBridge:
                         self.interface = alt.bInterfaceNumber
                         self.in_ep = ep_in.bEndpointAddress
                         self.out_ep = ep_out.bEndpointAddress
+                        self.in_max_packet = ep_in.wMaxPacketSize
                         return
         except Exception as e:
             raise XynError(f"Endpoint setup failed: {e}")
 
+    @staticmethod
+    def _definitely_odin(pid: int) -> bool:
+        """Known ODIN PIDs need no handshake probe"""
+        return pid in _ODIN_PIDS
+
     def _test_odin_mode(self) -> bool:
         """Test if device responds to ODIN handshake"""
         try:
             self.dev.write(self.out_ep, ODIN_MAGIC, timeout=1000)
-            resp = self.dev.read(self.in_ep, 8, timeout=2000)
+            # A device in ODIN mode answers at once; don't stall on MTP/ADB devices
+            resp = self.dev.read(self.in_ep, 8, timeout=200)
             resp_b = resp.tobytes() if hasattr(resp, 'tobytes') else bytes(resp)
             return resp_b.startswith(LOKE_MAGIC)
         except Exception:
@@ -488,7 +1120,8 @@ class ExynosBridge:
         if self.dev is None:
             raise XynError("No device to open")
         
-        try:            try:
+        try:
+            try:
                 self.dev.set_configuration()
             except Exception:
                 pass
@@ -505,7 +1138,8 @@ class ExynosBridge:
                         else:
                             ep_out = ep
                     if ep_in and ep_out:
-                        chosen = (alt, ep_in.bEndpointAddress, ep_out.bEndpointAddress)
+                        chosen = (alt, ep_in.bEndpointAddress, ep_out.bEndpointAddress,
+                                  ep_in.wMaxPacketSize)
                         break
                 if chosen:
                     break
@@ -513,10 +1147,11 @@ class ExynosBridge:
             if not chosen:
                 raise XynError("No suitable interface (requires bulk IN and OUT endpoints)")
             
-            alt, in_ep, out_ep = chosen
+            alt, in_ep, out_ep, in_max_packet = chosen
             self.interface = alt.bInterfaceNumber
             self.in_ep = in_ep
             self.out_ep = out_ep
+            self.in_max_packet = in_max_packet
             
             # Detach kernel driver if active
             try:
@@ -537,7 +1172,8 @@ class ExynosBridge:
     
     def establish_session(self, attempts: int = 3) -> bool:
         """
-        Establish ODIN protocol session        Sends ODIN magic, expects LOKE response
+        Establish ODIN protocol session
+        Sends ODIN magic, expects LOKE response
         """
         if self.dev is None:
             raise XynError("Device not connected")
@@ -569,8 +1205,7 @@ class ExynosBridge:
         
         try:
             # Send session end command
-            end_cmd = struct.pack('<B', OdinCommand.SESSION_END)
-            self.dev.write(self.out_ep, end_cmd, timeout=2000)
+            self.dev.write(self.out_ep, _SESSION_END_PKT, timeout=2000)
             self.session_established = False
             self._log("Session ended")
             return True
@@ -586,16 +1221,27 @@ class ExynosBridge:
         Uses heimdall if available, otherwise implements ODIN protocol
         """
         hb = self._find_heimdall()
-        if hb:            # Use heimdall (reliable)
+        if hb:
+            # Use heimdall (reliable)
             cmd = [hb, "download-pit", "--output", out_path]
             if self.verbose:
                 cmd.append("--verbose")
             
             self._log(f"Running heimdall: {' '.join(cmd)}")
-            r = subprocess.run(cmd, capture_output=True, timeout=60)
+            r = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=60)
             return r.returncode == 0
         
         # Python implementation using ODIN protocol
+        pit_data = self._download_pit_bytes()
+        
+        # Save to file
+        with open(out_path, "wb") as fh:
+            fh.write(pit_data)
+        
+        return True
+
+    def _download_pit_bytes(self) -> bytes:
+        """Download the PIT over the ODIN protocol straight into memory"""
         if not self.session_established:
             self.establish_session()
         
@@ -603,41 +1249,17 @@ class ExynosBridge:
             self._log("Downloading PIT file via ODIN protocol...")
             
             # Send GET_PIT command
-            cmd_pkt = struct.pack('<BI', OdinCommand.GET_PIT, 0)
-            self.dev.write(self.out_ep, cmd_pkt, timeout=self.timeout_ms)
+            self.dev.write(self.out_ep, _GET_PIT_PKT, timeout=self.timeout_ms)
             
-            # Read PIT data (can be large, read in chunks)
-            pit_data = bytearray()
-            chunk_size = 4096
-            max_size = 10 * 1024 * 1024  # 10MB max
-            
-            while len(pit_data) < max_size:
-                try:
-                    chunk = self.dev.read(self.in_ep, chunk_size, timeout=5000)
-                    chunk_bytes = chunk.tobytes() if hasattr(chunk, 'tobytes') else bytes(chunk)
-                    
-                    if not chunk_bytes:
-                        break
-                    
-                    pit_data.extend(chunk_bytes)
-                    
-                    # Check for end marker (heuristic)
-                    if len(chunk_bytes) < chunk_size:
-                        break
-                    
-                except usb.core.USBError as e:
-                    if e.errno == 110:  # Timeout
-                        break
-                    raise
+            # The reply is one length-prefixed packet, so read exactly that much
+            _, pit_data = self._receive_packet(expected_command=OdinCommand.GET_PIT,
+                                               max_length=10 * 1024 * 1024)  # 10MB max
             
             if len(pit_data) == 0:
                 raise XynError("No PIT data received")
             
-            # Save to file
-            with open(out_path, "wb") as fh:
-                fh.write(pit_data)            
             self._log(f"PIT file downloaded: {len(pit_data):,} bytes")
-            return True
+            return pit_data
             
         except Exception as e:
             raise XynError(f"PIT download failed: {e}")
@@ -653,14 +1275,40 @@ class ExynosBridge:
         
         try:
             # Packet format: [command (1B)] [length (4B)] [data]
-            pkt = struct.pack('<BI', command, len(data)) + data
+            # data may be any bytes-like object, e.g. a memoryview slice. Framing
+            # into an array('B') lets pyusb hand the buffer to libusb without converting it
+            pkt = self._out_packet(_ODIN_HEADER.size + len(data))
+            _ODIN_HEADER.pack_into(pkt, 0, command, len(data))
+            memoryview(pkt)[_ODIN_HEADER.size:] = data
             self.dev.write(self.out_ep, pkt, timeout=timeout)
             return True
         except Exception as e:
             raise OdinProtocolError(f"Send packet failed: {e}")
 
+    def _out_packet(self, size: int):
+        """Packet buffer of size bytes; full FILE_TRANSFER packets reuse one allocation"""
+        if size != _ODIN_HEADER.size + self.out_chunk_size:
+            return usb.util.create_buffer(size)
+        if self._out_buffer is None:
+            self._out_buffer = usb.util.create_buffer(size)
+        return self._out_buffer
+
+    def _in_staging(self, size: int):
+        """
+        Staging array for a bulk IN request of exactly size bytes (pyusb sizes the
+        request from the array); the full-transfer array and the last tail size are reused
+        """
+        if size == self._in_transfer_size():
+            if self._in_buffer is None or len(self._in_buffer) != size:
+                self._in_buffer = usb.util.create_buffer(size)
+            return self._in_buffer
+        if self._in_tail is None or len(self._in_tail) != size:
+            self._in_tail = usb.util.create_buffer(size)
+        return self._in_tail
+
     def _receive_packet(self, expected_command: Optional[int] = None, 
-                       timeout: Optional[int] = None) -> Tuple[int, bytes]:
+                       timeout: Optional[int] = None,
+                       max_length: Optional[int] = None) -> Tuple[int, bytearray]:
         """Receive ODIN protocol packet"""
         if not self.session_established:
             raise OdinProtocolError("Session not established")
@@ -670,32 +1318,109 @@ class ExynosBridge:
         try:
             # Read header (command + length)
             header = self.dev.read(self.in_ep, 5, timeout=timeout)
-            header_bytes = header.tobytes() if hasattr(header, 'tobytes') else bytes(header)
             
-            if len(header_bytes) < 5:
-                raise OdinProtocolError(f"Invalid packet header (got {len(header_bytes)} bytes)")
+            if len(header) < 5:
+                raise OdinProtocolError(f"Invalid packet header (got {len(header)} bytes)")
+            
+            command, length = _ODIN_HEADER.unpack(header)
             
-            command, length = struct.unpack('<BI', header_bytes)
+            if max_length is not None and length > max_length:
+                raise OdinProtocolError(f"Packet too large ({length:,} bytes, limit {max_length:,})")
             
-            # Read data
-            data = bytearray()
-            remaining = length
-            chunk_size = 4096
+            # Read data into a buffer sized from the header (up to PACKET_PREALLOC;
+            # past that the slice assignment extends it). pyusb only reads in place
+            # into array.array, so transfers land in one reused staging buffer and
+            # are copied into their slot of the packet
+            data = bytearray(min(length, PACKET_PREALLOC))
+            full = self._in_transfer_size()
+            off = 0
             
-            while remaining > 0:
-                chunk_len = min(chunk_size, remaining)
-                chunk = self.dev.read(self.in_ep, chunk_len, timeout=timeout)                chunk_bytes = chunk.tobytes() if hasattr(chunk, 'tobytes') else bytes(chunk)
-                data.extend(chunk_bytes)
-                remaining -= len(chunk_bytes)
+            while off < length:
+                buf = self._in_staging(min(full, length - off))
+                n = self.dev.read(self.in_ep, buf, timeout=timeout)
+                if n == 0:
+                    raise OdinProtocolError(f"Short packet ({off:,}/{length:,} bytes)")
+                data[off:off + n] = memoryview(buf)[:n]
+                off += n
             
             if expected_command is not None and command != expected_command:
                 raise OdinProtocolError(f"Unexpected command: {command} (expected {expected_command})")
             
-            return command, bytes(data)
+            # bytearray is fine for file.write and the parsers, skip the copy
+            return command, data
             
+        except usb.core.USBTimeoutError as e:
+            raise OdinTimeoutError(f"Receive packet timed out: {e}")
         except Exception as e:
             raise OdinProtocolError(f"Receive packet failed: {e}")
 
+    def _iter_packets(self, timeout: Optional[int] = None):
+        """Yield (command, data) packets read synchronously, one at a time"""
+        while True:
+            yield self._receive_packet(timeout=timeout)
+
+    @contextmanager
+    def _usb1_handle(self):
+        """
+        Open the connected device through usb1 for async transfers
+        pyusb releases the interface for the duration so usb1 can claim it
+        Yields None, with the pyusb claim restored, when usb1 cannot open or
+        claim the device (permissions, backend mismatch, kernel driver); the
+        caller then falls back to synchronous pyusb transfers
+        """
+        usb.util.release_interface(self.dev, self.interface)
+        ctx = handle = None
+        try:
+            ctx = usb1.USBContext()
+            for d in ctx.getDeviceIterator(skip_on_error=True):
+                if d.getBusNumber() == self.dev.bus and d.getDeviceAddress() == self.dev.address:
+                    handle = d.open()
+                    break
+            if handle is None:
+                raise XynError("usb1 could not open the connected device")
+            handle.claimInterface(self.interface)
+        except Exception as e:
+            if handle is not None:
+                handle.close()
+            if ctx is not None:
+                ctx.close()
+            usb.util.claim_interface(self.dev, self.interface)
+            self._log(f"usb1 unavailable ({e}), falling back to synchronous pyusb transfers")
+            yield None
+            return
+        
+        # Allocated on the first transfer that actually goes through usb1, then reused
+        if not self._transfer_buffers:
+            self.alloc_transfer_buffers()
+        try:
+            yield ctx, handle
+        finally:
+            try:
+                handle.releaseInterface(self.interface)
+                handle.close()
+            finally:
+                ctx.close()
+                usb.util.claim_interface(self.dev, self.interface)
+
+    def _iter_packets_async(self, ctx, handle, timeout: Optional[int] = None):
+        """Yield (command, data) packets parsed from a queued bulk IN stream"""
+        reader = _AsyncBulkReader(ctx, handle, self.in_ep, self._in_transfer_size(),
+                                  self.async_depth, timeout or self.timeout_ms,
+                                  spare=self._transfer_buffers)
+        pending = bytearray()
+        try:
+            for chunk in reader:
+                pending += chunk
+                while len(pending) >= 5:
+                    command, length = _ODIN_HEADER.unpack_from(pending)
+                    end = 5 + length
+                    if len(pending) < end:
+                        break
+                    yield command, pending[5:end]
+                    del pending[:end]
+        finally:
+            reader.close()
+
     # ==================== Partition Operations (COMPLETE) ====================
     
     def read_partition(self, partition_name: str, out_file: str) -> bool:
@@ -706,16 +1431,18 @@ class ExynosBridge:
         # Try heimdall first (recommended)
         if self._call_heimdall(["dump", partition_name, "--output", out_file]):
             self._log("✓ Read via heimdall succeeded")
+            self._log_digest(out_file)
             return True
         
         # Python implementation
         self._log("Reading partition using Python implementation...")
         
-        part = self.partition_manager.get_partition_by_name(partition_name)
+        pm = self.partition_manager
+        part = pm.get_partition_by_name(partition_name)
         if not part:
             # Try to detect partitions
-            self.partition_manager.detect_partition_layout()
-            part = self.partition_manager.get_partition_by_name(partition_name)
+            pm.detect_partition_layout()
+            part = pm.get_partition_by_name(partition_name)
             if not part:
                 raise XynError(f"Partition '{partition_name}' not found. Run 'partitions' command first.")
         
@@ -723,7 +1450,7 @@ class ExynosBridge:
             self.establish_session()
         
         try:
-            partition_id = self.partition_manager.guess_partition_identifier(partition_name)
+            partition_id = pm.guess_partition_identifier(partition_name)
             
             self._log(f"Reading partition '{partition_name}' (ID={partition_id})")
             
@@ -732,47 +1459,114 @@ class ExynosBridge:
             self._send_packet(OdinCommand.FILE_TRANSFER, cmd_data)
             
             # Receive file data
-            total_received = 0
-            buffer_size = 64 * 1024  # 64KB chunks            
-            with open(out_file, 'wb') as f:
-                while True:
-                    try:
-                        cmd, data = self._receive_packet(timeout=10000)
-                        
-                        if cmd == OdinCommand.FILE_COMPLETE:
-                            self._log(f"Read complete: {total_received:,} bytes")
-                            return True
-                        
-                        if cmd == OdinCommand.FILE_TRANSFER:
-                            f.write(data)
-                            total_received += len(data)
-                            
-                            if self.verbose and total_received % (buffer_size * 10) == 0:
-                                self._log(f"Received: {total_received:,} bytes")
-                        
-                        # Safety check: don't read more than 16GB
-                        if total_received > 16 * 1024 * 1024 * 1024:
-                            raise XynError("Partition too large (>16GB), aborting")
-                            
-                    except OdinProtocolError as e:
-                        if "timeout" in str(e).lower():
-                            self._log("Read timeout, assuming complete")
-                            return total_received > 0
-                        raise
+            with open(out_file, 'wb', buffering=DUMP_WRITE_BUFFER) as f:
+                ok = self._receive_into(f)
             
         except Exception as e:
             # Clean up partial file
-            if os.path.exists(out_file):
-                try:
-                    os.remove(out_file)
-                except Exception:
-                    pass
+            try:
+                os.unlink(out_file)
+            except FileNotFoundError:
+                pass
             raise XynError(f"Read partition failed: {e}")
+        
+        if ok:
+            self._log_digest(out_file)
+        return ok
+
+    def _receive_into(self, f) -> bool:
+        """Receive a FILE_TRANSFER stream into f, queued through usb1 when available"""
+        if usb1 is not None and self.async_depth > 1:
+            with self._usb1_handle() as opened:
+                if opened is not None:
+                    self._log(f"Using usb1 async reads ({self.async_depth} transfers queued)")
+                    ctx, handle = opened
+                    with closing(self._iter_packets_async(ctx, handle, timeout=10000)) as packets:
+                        return self._receive_file(packets, f)
+        return self._receive_file(self._iter_packets(timeout=10000), f)
 
-    def write_partition(self, partition_name: str, input_file: str, force: bool = False) -> bool:
+    def _log_digest(self, path: str) -> None:
+        """Log the SHA-256 of a dump (verbose only, as it re-reads the whole file)"""
+        if self.verbose:
+            self._log(f"SHA-256: {_file_digest(path, 'sha256')}")
+
+    def _receive_file(self, packets, f) -> bool:
+        """Write FILE_TRANSFER payloads to f until the device sends FILE_COMPLETE"""
+        total_received = 0
+        buffer_size = self._in_transfer_size()
+        
+        try:
+            for cmd, data in packets:
+                if cmd == OdinCommand.FILE_COMPLETE:
+                    self._log(f"Read complete: {total_received:,} bytes")
+                    return True
+                
+                if cmd == OdinCommand.FILE_TRANSFER:
+                    f.write(data)
+                    total_received += len(data)
+                    
+                    if self.verbose and total_received % (buffer_size * 10) == 0:
+                        self._log(_RECEIVED_FMT.format(total_received))
+                
+                # Safety check: don't read more than 16GB
+                if total_received > MAX_PARTITION_SIZE:
+                    raise XynError("Partition too large (>16GB), aborting")
+                    
+        except OdinTimeoutError:
+            self._log("Read timeout, assuming complete")
+            return total_received > 0
+        
+        return total_received > 0
+
+    @contextmanager
+    def _image_view(self, input_file: str, data=None):
+        """Flat read-only byte view of the image: data if given, else a mapping of input_file"""
+        if data is not None:
+            with memoryview(data) as mv, mv.cast('B') as view:
+                yield view
+            return
+        
+        # Slice the mapped file instead of allocating a bytes object per read
+        with open(input_file, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                memoryview(mm) as view:
+            yield view
+
+    def _send_file(self, view: memoryview, send) -> int:
+        """Send view as FILE_TRANSFER packets through send()"""
+        # One bulk OUT transfer per packet; the 4-byte length field imposes no 64 KiB cap
+        buffer_size = self.out_chunk_size
+        file_size = len(view)
+        total_sent = 0
+        last_log = time.monotonic()
+        pct_scale = 100.0 / file_size
+        
+        for off in range(0, file_size, buffer_size):
+            # Release each slice so the mapping can close afterwards
+            with view[off:off + buffer_size] as chunk:
+                send(OdinCommand.FILE_TRANSFER, chunk)
+                total_sent += len(chunk)
+            
+            # Progress indicator, at most every PROGRESS_INTERVAL seconds
+            if self.verbose:
+                now = time.monotonic()
+                if now - last_log >= PROGRESS_INTERVAL:
+                    percent = total_sent * pct_scale
+                    self._log(_SENT_FMT.format(total_sent, file_size, percent))
+                    last_log = now
+        
+        self._log(_SENT_FMT.format(total_sent, file_size, 100.0))
+        return total_sent
+
+    def write_partition(self, partition_name: str, input_file: str, force: bool = False,
+                        data=None, digest=None) -> bool:
         """
         Write file to partition
         Uses heimdall if available, otherwise implements ODIN protocol (requires --force)
+        digest is a Future of the checksum_algo hex digest (resolved after the send);
+        without it the hash runs alongside the send
+        data is the image already in memory (e.g. a memoryview over an mmap of input_file);
+        the Python implementation sends it instead of mapping input_file itself
         """
         # Try heimdall first (recommended)
         if self._call_heimdall(["flash", partition_name, input_file]):
@@ -782,24 +1576,28 @@ class ExynosBridge:
         # Python implementation (requires --force)
         if not force:
             raise XynError(
-                "Write requires heimdall or --force flag.\n"                "Install heimdall (recommended) or use --force to use Python implementation.\n"
+                "Write requires heimdall or --force flag.\n"
+                "Install heimdall (recommended) or use --force to use Python implementation.\n"
                 "WARNING: Python implementation is experimental!"
             )
         
         self._log("WARNING: Using Python write implementation (--force)")
         self._log("This is experimental - use at your own risk!")
         
-        if not os.path.exists(input_file):
+        if data is not None:
+            file_size = memoryview(data).nbytes
+        elif not os.path.exists(input_file):
             raise XynError(f"Input file does not exist: {input_file}")
-        
-        file_size = os.path.getsize(input_file)
+        else:
+            file_size = os.path.getsize(input_file)
         if file_size == 0:
             raise XynError("Input file is empty")
         
-        part = self.partition_manager.get_partition_by_name(partition_name)
+        pm = self.partition_manager
+        part = pm.get_partition_by_name(partition_name)
         if not part:
-            self.partition_manager.detect_partition_layout()
-            part = self.partition_manager.get_partition_by_name(partition_name)
+            pm.detect_partition_layout()
+            part = pm.get_partition_by_name(partition_name)
             if not part:
                 self._log(f"Warning: Partition '{partition_name}' not in PIT, proceeding anyway...")
         
@@ -807,47 +1605,57 @@ class ExynosBridge:
             self.establish_session()
         
         try:
-            partition_id = self.partition_manager.guess_partition_identifier(partition_name)
+            partition_id = pm.guess_partition_identifier(partition_name)
             
             self._log(f"Writing to partition '{partition_name}' (ID={partition_id})")
             self._log(f"File size: {file_size:,} bytes ({file_size / (1024*1024):.2f} MB)")
             
-            # Calculate checksum
-            self._log("Calculating file checksum...")
-            md5_hash = hashlib.md5()
-            with open(input_file, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    md5_hash.update(chunk)
-            checksum = md5_hash.hexdigest()
-            self._log(f"MD5 checksum: {checksum}")
+            # Created before anything is sent, so a hash that cannot run never
+            # leaves the device mid-transfer
+            hasher = _new_hash(self.checksum_algo) if digest is None else None
+            stop = threading.Event()
             
             # Send partition info
             part_info = struct.pack('<II', partition_id, file_size)
             self._send_packet(OdinCommand.PARTITION_INFO, part_info)
             
-            # Send file data in chunks
-            buffer_size = 128 * 1024  # 128KB chunks
-            total_sent = 0
+            with self._image_view(input_file, data) as view, \
+                    ThreadPoolExecutor(max_workers=1) as pool:
+                # The checksum is only reported, never sent. Hash the same mapping on a
+                # worker thread: update() releases the GIL, so it overlaps the USB sends
+                if hasher is not None:
+                    digest = pool.submit(_view_digest, view, hasher, stop)
+                
+                try:
+                    total_sent = None
+                    if usb1 is not None and self.async_depth > 1:
+                        with self._usb1_handle() as opened:
+                            if opened is not None:
+                                self._log(f"Using usb1 async writes ({self.async_depth} transfers queued)")
+                                ctx, handle = opened
+                                writer = _AsyncBulkWriter(ctx, handle, self.out_ep, self.out_chunk_size,
+                                                          self.async_depth, self.timeout_ms,
+                                                          spare=self._transfer_buffers)
+                                with closing(writer):
+                                    total_sent = self._send_file(view, writer.send)
+                                    writer.flush()
+                    if total_sent is None:
+                        total_sent = self._send_file(view, self._send_packet)
+                except BaseException:
+                    # Abandon the hash: the pool then only waits for the slice in progress
+                    stop.set()
+                    raise
+                
+                checksum = digest.result()
             
-            with open(input_file, 'rb') as f:
-                while True:
-                    chunk = f.read(buffer_size)                    if not chunk:
-                        break
-                    
-                    self._send_packet(OdinCommand.FILE_TRANSFER, chunk)
-                    total_sent += len(chunk)
-                    
-                    # Progress indicator
-                    if total_sent % (buffer_size * 5) == 0 or total_sent == file_size:
-                        percent = (total_sent / file_size) * 100
-                        self._log(f"Sent: {total_sent:,}/{file_size:,} bytes ({percent:.1f}%)")
+            self._log(f"{self.checksum_algo} checksum: {checksum}")
             
             # Send completion packet
             self._send_packet(OdinCommand.FILE_COMPLETE)
             
             # Wait for device acknowledgment
             try:
-                cmd, data = self._receive_packet(timeout=30000)
+                cmd, data = self._receive_packet(timeout=30000, max_length=ACK_MAX_LENGTH)
                 if cmd == OdinCommand.FILE_COMPLETE:
                     self._log(f"✓ Write succeeded: {total_sent:,} bytes written")
                     return True
@@ -862,6 +1670,36 @@ class ExynosBridge:
         except Exception as e:
             raise XynError(f"Write partition failed: {e}")
 
+    def write_partitions(self, items: List[Tuple[str, str]], force: bool = False) -> bool:
+        """
+        Write several (partition_name, input_file) pairs in order, stopping at the first failure
+        For Python-implementation writes, images are hashed on a worker pool: each
+        write gets its pending digest and only waits for it after its own send
+        Heimdall writes report no checksum, so nothing is hashed for them
+        """
+        if not force or self._find_heimdall():
+            for name, path in items:
+                if not self.write_partition(name, path, force=force):
+                    self._log(f"Write to '{name}' failed, skipping remaining partitions")
+                    return False
+            return True
+        
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            digests = [pool.submit(_file_digest, path, self.checksum_algo, stop) for _, path in items]
+            try:
+                for (name, path), digest in zip(items, digests):
+                    if not self.write_partition(name, path, force=force, digest=digest):
+                        self._log(f"Write to '{name}' failed, skipping remaining partitions")
+                        return False
+            finally:
+                # Drop queued hashes and stop running ones so leaving the pool is quick
+                stop.set()
+                for digest in digests:
+                    digest.cancel()
+        
+        return True
+
     def erase_partition(self, partition_name: str, force: bool = False) -> bool:
         """
         Erase partition
@@ -879,9 +1717,11 @@ class ExynosBridge:
         # Python implementation
         self._log("Erasing partition using Python implementation...")
         
-        part = self.partition_manager.get_partition_by_name(partition_name)
-        if not part:            self.partition_manager.detect_partition_layout()
-            part = self.partition_manager.get_partition_by_name(partition_name)
+        pm = self.partition_manager
+        part = pm.get_partition_by_name(partition_name)
+        if not part:
+            pm.detect_partition_layout()
+            part = pm.get_partition_by_name(partition_name)
             if not part:
                 self._log(f"Warning: Partition '{partition_name}' not in PIT, proceeding anyway...")
         
@@ -889,7 +1729,7 @@ class ExynosBridge:
             self.establish_session()
         
         try:
-            partition_id = self.partition_manager.guess_partition_identifier(partition_name)
+            partition_id = pm.guess_partition_identifier(partition_name)
             
             self._log(f"Erasing partition '{partition_name}' (ID={partition_id})")
             
@@ -899,18 +1739,17 @@ class ExynosBridge:
             
             # Wait for completion
             try:
-                cmd, data = self._receive_packet(timeout=60000)  # 60s timeout for erase
+                cmd, data = self._receive_packet(timeout=60000,  # 60s timeout for erase
+                                                 max_length=ACK_MAX_LENGTH)
                 if cmd == OdinCommand.FILE_COMPLETE:
                     self._log(f"✓ Erase succeeded")
                     return True
                 else:
                     self._log(f"Unexpected response: cmd={cmd}")
                     return False
-            except OdinProtocolError as e:
-                if "timeout" in str(e).lower():
-                    self._log("Erase timeout - may still be in progress")
-                    return False
-                raise
+            except OdinTimeoutError:
+                self._log("Erase timeout - may still be in progress")
+                return False
             
         except Exception as e:
             raise XynError(f"Erase partition failed: {e}")
@@ -929,8 +1768,10 @@ class ExynosBridge:
             cmd.append("--verbose")
         
         self._log(f"Calling heimdall: {' '.join(cmd)}")
-                try:
-            r = subprocess.run(cmd, capture_output=True, timeout=300)
+        
+        try:
+            # stdout is progress chatter; only stderr is logged on failure
+            r = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=300)
             if r.returncode == 0:
                 return True
             else:
@@ -8,35 +8,176 @@ Usage examples:
   python xyn_cli.py read BOOT boot.img
   python xyn_cli.py write BOOT boot.img
   python xyn_cli.py erase userdata
+  python xyn_cli.py flash-all BOOT=boot.img RECOVERY=recovery.img
 """
-import argparse
 import sys
 import os
-from bridge import ExynosBridge, XynError
+import mmap
+import stat
+import types
 
 def validate_file_exists(path, operation):
-    """Validate file exists for read/write operations"""
+    """Validate file exists for read/write operations; returns the os.stat_result checked"""
+    from bridge import XynError
     if operation == 'read':
         # Output file directory must exist
         dir_path = os.path.dirname(path)
-        if dir_path and not os.path.exists(dir_path):
+        if not dir_path:
+            return None
+        try:
+            st = os.stat(dir_path)
+        except FileNotFoundError:
             raise XynError(f"Output directory does not exist: {dir_path}")
+        if not stat.S_ISDIR(st.st_mode):
+            raise XynError(f"Output directory is not a directory: {dir_path}")
+        return st
     elif operation == 'write':
         # Input file must exist
-        if not os.path.exists(path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
             raise XynError(f"Input file does not exist: {path}")
-        if not os.path.isfile(path):
+        if not stat.S_ISREG(st.st_mode):
             raise XynError(f"Input path is not a file: {path}")
+        return st
 
-def main():
+# Readahead primed before a write starts, so the first packets are not stuck behind the disk
+WILLNEED_BYTES = 64 * 1024 * 1024
+
+def advise_sequential(fd, mm, size):
+    """Tell the kernel the image is read front to back, where the platform supports it"""
+    if hasattr(os, 'posix_fadvise'):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        os.posix_fadvise(fd, 0, min(size, WILLNEED_BYTES), os.POSIX_FADV_WILLNEED)
+    if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+
+# `partitions` table layout
+ROW_FMT = "{:<20} {:<12} {:<6} {:<10}\n"
+HEADER = ROW_FMT.format("Partition Name", "Size (MB)", "ID", "Status")
+RULE = "-" * 55 + "\n"
+
+# Fixed messages, encoded once and written straight to the byte stream by _emit()
+_ENCODING = getattr(sys.stdout, 'encoding', None) or 'utf-8'
+
+def _encode(text):
+    return text.encode(_ENCODING, 'replace')
+
+_CONNECT_FAILED = _encode("ERROR: Failed to connect to a device in ODIN mode.\n"
+                          "Make sure device is in Download/ODIN mode and USB debugging is enabled.\n")
+_DETECT_OK = _encode("✓ Device found and connected successfully.\n")
+_DETECT_INFO = b"  Device: VID=0x%04x PID=0x%04x\n  Interface: %d\n  Endpoints: IN=0x%02x OUT=0x%02x\n"
+_DETECTING = b"Detecting partition layout...\n"
+_NO_PARTITIONS = b"ERROR: No partitions detected.\nTry: Install heimdall for better partition detection\n"
+_HEIMDALL_NOTE = b"\nNote: Using heimdall if available (recommended)\n"
+_DESTRUCTIVE = b"This operation is DESTRUCTIVE and cannot be undone!\n"
+_CANCELLED = b"Operation cancelled.\n"
+_INTERRUPTED = b"\nOperation cancelled by user.\n"
+_READ_FAILED = _encode("✗ Read operation failed.\n")
+_ERASE_OK = _encode("✓ Erase operation succeeded.\n")
+_ERASE_FAILED = _encode("✗ Erase operation failed.\n")
+_WRITE_OK = _encode("✓ Write operation succeeded.\n")
+_WRITE_FAILED = _encode("✗ Write operation failed.\n")
+_FLASH_OK = _encode("✓ Flash operation succeeded.\n")
+_FLASH_FAILED = _encode("✗ Flash operation failed.\n")
+
+def _emit(data):
+    """Write pre-encoded output, flushing print() output first so the order is kept"""
+    out = sys.stdout
+    buf = getattr(out, 'buffer', None)
+    if buf is None:
+        out.write(data.decode(_ENCODING))
+        return
+    out.flush()
+    buf.write(data)
+
+# Defaults of every global option, shared by the argparse parser and the fast path
+GLOBAL_DEFAULTS = {
+    'verbose': False,
+    'timeout': 30,
+    'chunk_size': None,
+    'in_chunk_size': None,
+    'out_chunk_size': None,
+    'concurrency': None,
+    'checksum_algo': 'auto',
+    'no_pit_cache': False,
+    'clean_exit': False,
+}
+
+# Global options the fast path understands; any other token falls back to argparse
+_FAST_FLAGS = {'--verbose': 'verbose', '-v': 'verbose', '--no-pit-cache': 'no_pit_cache',
+               '--clean-exit': 'clean_exit'}
+
+def _fast_args(argv):
+    """
+    Parse the common `detect`/`partitions` invocations without building the
+    argparse parser. Returns None for anything else (other commands, -h,
+    options it does not know, bad values) so argparse handles and reports it.
+    """
+    args = types.SimpleNamespace(command=None, refresh=False, **GLOBAL_DEFAULTS)
+    i, n = 0, len(argv)
+    while i < n:
+        tok = argv[i]
+        i += 1
+        if tok in _FAST_FLAGS:
+            setattr(args, _FAST_FLAGS[tok], True)
+        elif tok in ('--timeout', '-t') or tok.startswith('--timeout='):
+            if '=' in tok:
+                value = tok.partition('=')[2]
+            elif i < n:
+                value = argv[i]
+                i += 1
+            else:
+                return None
+            try:
+                args.timeout = int(value)
+            except ValueError:
+                return None
+        elif tok in ('detect', 'partitions'):
+            args.command = tok
+            break
+        else:
+            return None
+    if args.command is None:
+        return None
+    rest = argv[i:]
+    if args.command == 'partitions' and rest == ['--refresh']:
+        args.refresh = True
+    elif rest:
+        return None
+    return args
+
+def _build_parser():
+    # argparse (and the gettext/re it pulls in) is only loaded when the fast path declines
+    import argparse
     parser = argparse.ArgumentParser(description='XynClient - Exynos Tool (Complete Implementation)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose output')
-    parser.add_argument('--timeout', '-t', type=int, default=30, help='USB timeout in seconds (default: 30)')
+    parser.add_argument('--timeout', '-t', type=int, help='USB timeout in seconds (default: %(default)s)')
+    parser.add_argument('--chunk-size', type=int,
+                        help='Bulk transfer size in bytes for both directions (default: 1 MiB)')
+    parser.add_argument('--in-chunk-size', type=int,
+                        help='Bulk IN transfer size in bytes (default: --chunk-size)')
+    parser.add_argument('--out-chunk-size', type=int,
+                        help='Bulk OUT packet payload size in bytes for --force writes (default: --chunk-size)')
+    parser.add_argument('--concurrency', type=int,
+                        help='Bulk transfers kept in flight when python-libusb1 is installed; 1 disables queuing (default: 8)')
+    parser.add_argument('--checksum-algo', metavar='ALGO',
+                        help='Checksum logged for --force writes: auto, md5, sha256, blake3 or xxh3 '
+                             '(default: auto, fastest installed of blake3/xxh3/md5)')
+
+    parser.add_argument('--no-pit-cache', action='store_true',
+                        help='Do not read or write the on-disk partition layout cache')
+    parser.add_argument('--clean-exit', action='store_true',
+                        help='Always release the device and shut down the interpreter normally, '
+                             'even after detect/partitions')
+    parser.set_defaults(**GLOBAL_DEFAULTS)
 
     subparsers = parser.add_subparsers(dest='command', help='Command to execute', required=True)
 
     subparsers.add_parser('detect', help='Detect a connected device in ODIN mode')
-    subparsers.add_parser('partitions', help='List all partitions from PIT')
+    partitions_parser = subparsers.add_parser('partitions', help='List all partitions from PIT')
+    partitions_parser.add_argument('--refresh', action='store_true',
+                                   help='Re-read the PIT from the device instead of the cache')
 
     read_parser = subparsers.add_parser('read', help='Read a partition to a file')
     read_parser.add_argument('partition_name', help='Name of the partition to read')
@@ -47,46 +188,94 @@ def main():
     erase_parser.add_argument('--force', action='store_true', required=True, 
                              help='Force erase (DANGEROUS - requires explicit confirmation)')
 
-    write_parser = subparsers.add_parser('write', help='Write a file to a partition')    write_parser.add_argument('partition_name', help='Name of the partition to write to')
+    write_parser = subparsers.add_parser('write', help='Write a file to a partition')
+    write_parser.add_argument('partition_name', help='Name of the partition to write to')
     write_parser.add_argument('input_file', help='Path to the file to flash')
     write_parser.add_argument('--force', action='store_true', 
                              help='Force write using Python implementation (requires heimdall unavailable)')
 
-    args = parser.parse_args()
+    flash_parser = subparsers.add_parser('flash-all', help='Write several files to their partitions in one session')
+    flash_parser.add_argument('images', nargs='+', metavar='PARTITION=FILE',
+                              help='Partition name and the file to flash into it')
+    flash_parser.add_argument('--force', action='store_true',
+                             help='Force write using Python implementation (requires heimdall unavailable)')
+    return parser
+
+def main():
+    # detect/partitions from scripts are the common case; skip building the full parser for them
+    parser = None
+    args = _fast_args(sys.argv[1:])
+    if args is None:
+        parser = _build_parser()
+        args = parser.parse_args()
+
+    def usage_error(message):
+        (parser or _build_parser()).error(message)
+
+    # Imported only once there is work to do: pyusb/usb1/numpy make this the slow part
+    # of startup, and --help or a usage error never needs it
+    from bridge import ExynosBridge, XynError, BufferedLogger, BULK_CHUNK, ASYNC_DEPTH, CHECKSUM_ALGOS
 
-    bridge = ExynosBridge(verbose=args.verbose, timeout=args.timeout)
+    if args.checksum_algo not in CHECKSUM_ALGOS:
+        usage_error(f"--checksum-algo must be one of: {', '.join(CHECKSUM_ALGOS)}")
+    chunk_size = BULK_CHUNK if args.chunk_size is None else args.chunk_size
+    in_chunk_size = chunk_size if args.in_chunk_size is None else args.in_chunk_size
+    out_chunk_size = chunk_size if args.out_chunk_size is None else args.out_chunk_size
+    if in_chunk_size <= 0 or out_chunk_size <= 0:
+        usage_error("chunk sizes must be positive")
+    concurrency = ASYNC_DEPTH if args.concurrency is None else args.concurrency
+    if concurrency < 1:
+        usage_error("--concurrency must be at least 1")
 
+    # Verbose output goes to stderr in batches, written by a background thread
+    # so progress logging never holds up a transfer
+    log = BufferedLogger(sys.stderr.fileno()) if args.verbose else None
+    try:
+        bridge = ExynosBridge(verbose=args.verbose, timeout=args.timeout, in_chunk_size=in_chunk_size,
+                              out_chunk_size=out_chunk_size, async_depth=concurrency,
+                              checksum_algo=args.checksum_algo, pit_cache=not args.no_pit_cache,
+                              logger=log)
+    except XynError as e:
+        # e.g. --checksum-algo naming a module that is not installed
+        usage_error(str(e))
+
+    # detect/partitions never leave a transfer half-done, so on success they end the
+    # ODIN session and let process exit free the interface instead of a full teardown
+    quick_exit = False
     try:
         # connect() now properly establishes session and returns True on success
         if not bridge.connect():
-            print("ERROR: Failed to connect to a device in ODIN mode.")
-            print("Make sure device is in Download/ODIN mode and USB debugging is enabled.")
+            _emit(_CONNECT_FAILED)
             return 1
 
         if args.command == 'detect':
-            print("✓ Device found and connected successfully.")
-            print(f"  Device: VID={hex(bridge.dev.idVendor)} PID={hex(bridge.dev.idProduct)}")
-            print(f"  Interface: {bridge.interface}")
-            print(f"  Endpoints: IN={hex(bridge.in_ep)} OUT={hex(bridge.out_ep)}")
+            dev = bridge.dev
+            _emit(_DETECT_OK + _DETECT_INFO % (dev.idVendor, dev.idProduct, bridge.interface,
+                                               bridge.in_ep, bridge.out_ep))
+            quick_exit = not args.clean_exit
             return 0
 
         elif args.command == 'partitions':
-            print("Detecting partition layout...")
-            partitions = bridge.partition_manager.detect_partition_layout()
+            _emit(_DETECTING)
+            partitions = bridge.partition_manager.detect_partition_layout(refresh=args.refresh, use_cache=True)
             if not partitions:
-                print("ERROR: No partitions detected.")
-                print("Try: Install heimdall for better partition detection")
+                _emit(_NO_PARTITIONS)
                 return 1
             
-            print(f"\n{'Partition Name':<20} {'Size (MB)':<12} {'ID':<6} {'Status':<10}")
-            print("-" * 55)
-            for name, info in sorted(partitions.items()):
+            # Build the whole table and emit it with one write
+            inv_mb = 1.0 / (1024 * 1024)
+            rows = ["\n", HEADER, RULE]
+            for name, info in bridge.partition_manager.sorted_partitions:
                 size = info.get('length', 0)
-                size_mb = f"{size / (1024*1024):.1f}" if size else "Unknown"
-                pid = info.get('id', 'N/A')
+                size_mb = f"{size * inv_mb:.1f}" if size else "Unknown"
+                pid = info.get('id')
+                if pid is None:
+                    pid = 'N/A'
                 status = "OK" if size else "Partial"
-                print(f"{name:<20} {size_mb:<12} {pid:<6} {status:<10}")
-            print(f"\nTotal partitions: {len(partitions)}")
+                rows.append(ROW_FMT.format(name, size_mb, pid, status))
+            rows.append(f"\nTotal partitions: {len(partitions)}\n")
+            sys.stdout.write("".join(rows))
+            quick_exit = not args.clean_exit
             return 0
 
         elif args.command == 'read':
@@ -96,66 +285,113 @@ def main():
             success = bridge.read_partition(args.partition_name, args.output_file)
             if success:
                 file_size = os.path.getsize(args.output_file)
-                print(f"✓ Read operation succeeded. ({file_size:,} bytes)")                return 0
+                print(f"✓ Read operation succeeded. ({file_size:,} bytes)")
+                return 0
             else:
-                print("✗ Read operation failed.")
+                _emit(_READ_FAILED)
                 return 1
 
         elif args.command == 'erase':
             print(f"WARNING: This will ERASE partition '{args.partition_name}'")
-            print("This operation is DESTRUCTIVE and cannot be undone!")
-            confirm = input("Type 'YES' to confirm: ")
-            if confirm.strip() != 'YES':
-                print("Operation cancelled.")
+            _emit(_DESTRUCTIVE)
+            sys.stdout.write("Type 'YES' to confirm: ")
+            sys.stdout.flush()
+            # One raw read of the typed line (or piped input); EOF reads as empty and cancels
+            confirm = os.read(sys.stdin.fileno(), 64)
+            if confirm.strip() != b'YES':
+                _emit(_CANCELLED)
                 return 2
             
             print(f"Erasing partition '{args.partition_name}'...")
             success = bridge.erase_partition(args.partition_name, force=True)
             if success:
-                print(f"✓ Erase operation succeeded.")
+                _emit(_ERASE_OK)
                 return 0
             else:
-                print("✗ Erase operation failed.")
+                _emit(_ERASE_FAILED)
                 return 1
 
         elif args.command == 'write':
-            validate_file_exists(args.input_file, 'write')
-            file_size = os.path.getsize(args.input_file)
+            file_size = validate_file_exists(args.input_file, 'write').st_size
             
             print(f"Writing to partition '{args.partition_name}' from '{args.input_file}'")
             print(f"File size: {file_size:,} bytes ({file_size / (1024*1024):.2f} MB)")
             
             if not args.force:
-                print("\nNote: Using heimdall if available (recommended)")
+                _emit(_HEIMDALL_NOTE)
+            
+            if file_size == 0:
+                # Nothing to map; let the bridge report the empty file
+                success = bridge.write_partition(args.partition_name, args.input_file, force=args.force)
+            else:
+                # Map the image once here; the Python implementation streams slices of it
+                with open(args.input_file, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                        memoryview(mm) as view:
+                    advise_sequential(f.fileno(), mm, file_size)
+                    success = bridge.write_partition(args.partition_name, args.input_file,
+                                                     force=args.force, data=view)
+            if success:
+                _emit(_WRITE_OK)
+                return 0
+            else:
+                _emit(_WRITE_FAILED)
+                return 1
+
+        elif args.command == 'flash-all':
+            items = []
+            for spec in args.images:
+                name, sep, path = spec.partition('=')
+                if not sep or not name or not path:
+                    raise XynError(f"Expected PARTITION=FILE, got: {spec}")
+                validate_file_exists(path, 'write')
+                items.append((name, path))
+            
+            print(f"Flashing {len(items)} partitions:")
+            for name, path in items:
+                print(f"  {name:<20} <- {path}")
+            
+            if not args.force:
+                _emit(_HEIMDALL_NOTE)
             
-            success = bridge.write_partition(args.partition_name, args.input_file, force=args.force)
+            success = bridge.write_partitions(items, force=args.force)
             if success:
-                print(f"✓ Write operation succeeded.")
+                _emit(_FLASH_OK)
                 return 0
             else:
-                print("✗ Write operation failed.")
+                _emit(_FLASH_FAILED)
                 return 1
 
     except XynError as e:
         print(f"ERROR: {e}")
         return 1
     except KeyboardInterrupt:
-        print("\nOperation cancelled by user.")
+        _emit(_INTERRUPTED)
         return 2
     except Exception as e:
         print(f"UNEXPECTED ERROR: {e}")
         if args.verbose:
-            import traceback            traceback.print_exc()
+            import traceback
+            log.flush()
+            traceback.print_exc()
         return 1
     finally:
+        if quick_exit and bridge.dev and not bridge.detached_kernel:
+            bridge.disconnect(release=False)
+            sys.stdout.flush()
+            if log is not None:
+                log.close()
+            os._exit(0)
         try:
             if bridge.dev:
                 bridge.disconnect()
                 if args.verbose:
-                    print("[DEBUG] Device disconnected cleanly")
+                    log.log("[DEBUG] Device disconnected cleanly")
         except Exception as e:
             if args.verbose:
-                print(f"[DEBUG] Error during cleanup: {e}")
+                log.log(f"[DEBUG] Error during cleanup: {e}")
+        if log is not None:
+            log.close()
 
 if __name__ == '__main__':
     sys.exit(main())
\ No newline at end of file